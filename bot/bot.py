@@ -1,22 +1,24 @@
 import os
 import logging
 import asyncio
+from pathlib import Path
 from collections import defaultdict
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Bot, InputFile
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Bot
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
-from telegram.helpers import escape_markdown
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
 from datetime import datetime, timezone
 
 # Import our custom modules
-from bot.web_parser import parse_article
-from bot.summary import summarize_article_by_gemini, summarize_article_by_openai, ResponseError
+from bot.web_parser import parse_article_async
+from bot import summary as summarizers
+from bot.summary import ResponseError
 from bot.text_to_speech import convert_text_to_speech
 from bot.content_db import ContentDB, VocabularyItem
-from bot.helper import format_vocabulary, trim_message
+from bot.helper import escape_markdown_v2, format_vocabulary, trim_message
+from bot.telegram_sender import TELEGRAM_CONNECTION_POOL_SIZE
 from bot.settings import settings, AgentEngine
 
 # Configure logging
@@ -87,13 +89,15 @@ async def process_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     url = update.message.text
 
+    text_to_speech_task = None
+    text_to_speech_result = None
+
     # Check if content already exists in the database
     existing_content = content_db.get_content(url)
     if existing_content:
         logger.info(f"Content for {url} already exists.")
         await update.message.reply_text("Content for this URL already exists. Retrieving...")
         file_paths = existing_content
-        text_to_speech_result = None
         vocabulary = existing_content.get("vocabulary")
     else:
         await update.message.reply_text("Processing the URL...")
@@ -101,7 +105,7 @@ async def process_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Step 1: Parse the web page
         logger.info(f"Requesting the article from {url}.")
-        title, content = parse_article(url)
+        title, content = await parse_article_async(url)
         if not title or not content:
             await update.message.reply_text("Failed to parse the article. Please try another URL.")
             return
@@ -109,77 +113,98 @@ async def process_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Step 2: Summarize the article
         if settings.agent_engine == AgentEngine.GEMINI:
             logger.info(f"Handling the article with Gemini.")
-            summary = summarize_article_by_gemini(content, session_id=timestamp)
+            summary = await summarizers.summarize_article_by_gemini_async(content, session_id=timestamp)
         else:
             # settings.agent_engine == AgentEngine.OPENAI
             logger.info(f"Handling the article with OpenAI.")
-            summary = summarize_article_by_openai(content, session_id=timestamp)
+            # The OpenAI summarizer is synchronous, so it runs in a worker thread to keep the event loop free
+            summary = await asyncio.to_thread(summarizers.summarize_article_by_openai, content, session_id=timestamp)
         
+        if summary is None:
+            await update.message.reply_text("Failed to summarize the article. Please try another URL.")
+            return
         if isinstance(summary, ResponseError):
             await update.message.reply_text(f"Failed to summarize the article. Error: '{summary.error}'. Please try another URL.")
             return
 
         vocabulary = summary.vocabulary
 
-        # Step 3: Convert summary to speech (if enabled)
+        # Step 3: Save files
         audio_file_path = ""
-        text_to_speech_result = None
         if not settings.disable_voice_notes:
             audio_output_dir = settings.audio_output_dir
             os.makedirs(audio_output_dir, exist_ok=True)
             audio_file_path = os.path.join(audio_output_dir, f"audio_{timestamp}.mp3")
-            logger.info(f"Sending a request to ElevenLabs to create a voice note.")
-            text_to_speech_result = convert_text_to_speech(summary.news_original, summary.voice_tag, audio_file_path)
-            if not text_to_speech_result:
-                audio_file_path = ""
-                await update.message.reply_text("Failed to convert text to speech. Continuing without voice note.")
 
-        # Step 4: Save files
         logger.info(f"Saving files with timestamp {timestamp}.")
         file_paths = save_files(content, summary, audio_file_path, timestamp)
 
-        # Add content to the database
-        logger.info(f"Updating the content DB.")
-        content_db.add_content(url, file_paths, vocabulary)
+        # Step 4: Convert summary to speech (if enabled).
+        # The conversion runs in a worker thread while the text content is sent
+        # to the operator, and is awaited only before sending the voice note
+        if audio_file_path:
+            logger.info(f"Sending a request to ElevenLabs to create a voice note.")
+            text_to_speech_task = asyncio.create_task(
+                asyncio.to_thread(convert_text_to_speech, summary.news_original, summary.voice_tag, audio_file_path)
+            )
+
+    try:
+        # Step 5: Send files to operator
+        # Send vocabulary
+        if vocabulary:
+            formatted_vocabulary = format_vocabulary(vocabulary)
+            vocabulary_message = f"Useful for understanding vocabulary:\n\n{formatted_vocabulary}"
+            
+            await update.message.reply_text(
+                trim_message(vocabulary_message),
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
 
-    # Step 5: Send files to operator
-    # Send vocabulary
-    if vocabulary:
-        formatted_vocabulary = format_vocabulary(vocabulary)
-        vocabulary_message = f"Useful for understanding vocabulary:\n\n{formatted_vocabulary}"
+        with open(file_paths['transcript'], 'r', encoding='utf-8') as f:
+            transcript = f.read()
+            transcript_length = len(transcript)
+            await update.message.reply_text(
+                f"Transcript (length: {transcript_length} characters):\n\n{transcript}"
+            )
         
-        await update.message.reply_text(
-            trim_message(vocabulary_message),
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
+        with open(file_paths['translation'], 'r', encoding='utf-8') as f:
+            await update.message.reply_text(f"Translation:\n\n{f.read()}")
+
+    finally:
+        # The conversion is awaited and the content recorded even if a reply to the operator
+        # fails, so that the paid work is not lost and the URL is not processed again
+        if text_to_speech_task:
+            try:
+                text_to_speech_result = await text_to_speech_task
+            except Exception as e:
+                logger.error(f"Text-to-speech conversion failed: {e}")
+            if not text_to_speech_result:
+                file_paths['audio'] = ""
 
-    if file_paths['audio'] and os.path.exists(file_paths['audio']):
-        with open(file_paths['audio'], 'rb') as audio:
-            if text_to_speech_result:
-                # Format the reset date
-                reset_date = datetime.fromtimestamp(text_to_speech_result['next_reset_timestamp'], tz=timezone.utc).strftime("%Y-%m-%d")
-                
-                caption = (f"Used tokens: {text_to_speech_result['used_tokens']}\n"
-                           f"Remaining characters: {text_to_speech_result['remaining_characters']}\n"
-                           f"Next reset date: {reset_date}")
-                
-                await update.message.reply_voice(audio, caption=caption)
-            else:
-                await update.message.reply_voice(audio)
+        if not existing_content:
+            # Add content to the database
+            logger.info(f"Updating the content DB.")
+            content_db.add_content(url, file_paths, vocabulary)
+
+    if text_to_speech_task and not text_to_speech_result:
+        await update.message.reply_text("Failed to convert text to speech. Continuing without voice note.")
+
+    if text_to_speech_result:
+        # Format the reset date
+        reset_date = datetime.fromtimestamp(text_to_speech_result['next_reset_timestamp'], tz=timezone.utc).strftime("%Y-%m-%d")
+        
+        caption = (f"Used tokens: {text_to_speech_result['used_tokens']}\n"
+                   f"Remaining characters: {text_to_speech_result['remaining_characters']}\n"
+                   f"Next reset date: {reset_date}")
+        
+        # The audio has just been generated, so upload it from memory instead of re-reading the file
+        await update.message.reply_voice(text_to_speech_result['audio_data'], caption=caption)
+    elif file_paths['audio'] and os.path.exists(file_paths['audio']):
+        await update.message.reply_voice(Path(file_paths['audio']))
     elif settings.disable_voice_notes:
         await update.message.reply_text("Voice note generation is disabled.")
     else:
         await update.message.reply_text("Voice note is not available for this content.")
-    
-    with open(file_paths['transcript'], 'r', encoding='utf-8') as f:
-        transcript = f.read()
-        transcript_length = len(transcript)
-        await update.message.reply_text(
-            f"Transcript (length: {transcript_length} characters):\n\n{transcript}"
-        )
-    
-    with open(file_paths['translation'], 'r', encoding='utf-8') as f:
-        await update.message.reply_text(f"Translation:\n\n{f.read()}")
 
     # Store current content for this specific operator
     operator_contexts[user_id] = OperatorMessageContext(
@@ -227,24 +252,24 @@ async def handle_confirmation(update: Update, context: ContextTypes.DEFAULT_TYPE
             # Send voice note if path is provided and file exists
             if operator_context.voice_note_path and os.path.exists(operator_context.voice_note_path):
             # Send voice note with vocabulary as caption
-                with open(operator_context.voice_note_path, 'rb') as voice_note:
-                    if operator_context.vocabulary:
-                        formatted_vocabulary = format_vocabulary(operator_context.vocabulary)
-                        vocabulary_message = f"Palabras para entender el audio:\n{formatted_vocabulary}"
-                        
-                        message = await bot.send_voice(
-                            chat_id=settings.telegram_channel_id,
-                            voice=InputFile(voice_note),
-                            caption=trim_message(vocabulary_message),
-                            parse_mode=ParseMode.MARKDOWN_V2
-                        )
-                    else:
-                        message = await bot.send_voice(
-                            chat_id=settings.telegram_channel_id,
-                            voice=InputFile(voice_note)
-                        )
-
-                    logger.info(f"Voice note sent to the channel.")
+                voice_note = Path(operator_context.voice_note_path)
+                if operator_context.vocabulary:
+                    formatted_vocabulary = format_vocabulary(operator_context.vocabulary)
+                    vocabulary_message = f"Palabras para entender el audio:\n{formatted_vocabulary}"
+                    
+                    message = await bot.send_voice(
+                        chat_id=settings.telegram_channel_id,
+                        voice=voice_note,
+                        caption=trim_message(vocabulary_message),
+                        parse_mode=ParseMode.MARKDOWN_V2
+                    )
+                else:
+                    message = await bot.send_voice(
+                        chat_id=settings.telegram_channel_id,
+                        voice=voice_note
+                    )
+
+                logger.info(f"Voice note sent to the channel.")
             else:
                 # Send vocabulary if available
                 if operator_context.vocabulary:
@@ -330,8 +355,8 @@ async def finish_confirmation_handling(context: ContextTypes.DEFAULT_TYPE, reply
         # Send transcription with URL
         with open(operator_context.transcript_path, 'r', encoding='utf-8') as f:
             transcript_text = f.read()
-        escaped_transcript = escape_markdown(transcript_text, version=2)
-        escaped_url = escape_markdown(operator_context.url, version=2)
+        escaped_transcript = escape_markdown_v2(transcript_text)
+        escaped_url = escape_markdown_v2(operator_context.url)
         await context.bot.send_message(
             chat_id=settings.telegram_discussion_group_id,
             text=f"{escaped_url}\n\n*Español:*\n||{escaped_transcript}||",
@@ -348,7 +373,7 @@ async def finish_confirmation_handling(context: ContextTypes.DEFAULT_TYPE, reply
         # Send translation
         with open(operator_context.translation_path, 'r', encoding='utf-8') as f:
             translation_text = f.read()
-        escaped_translation = escape_markdown(translation_text, version=2)
+        escaped_translation = escape_markdown_v2(translation_text)
         await context.bot.send_message(
             chat_id=settings.telegram_discussion_group_id,
             text=f"*Ruso:*\n||{escaped_translation}||",
@@ -376,7 +401,15 @@ async def finish_confirmation_handling(context: ContextTypes.DEFAULT_TYPE, reply
             )
 
 def main():
-    application = Application.builder().token(settings.telegram_bot_token).build()
+    # Keep one HTTP/2 connection pool for all Bot API calls so that concurrent sends
+    # and media uploads are multiplexed over already established connections
+    application = (
+        Application.builder()
+        .token(settings.telegram_bot_token)
+        .http_version("2")
+        .connection_pool_size(TELEGRAM_CONNECTION_POOL_SIZE)
+        .build()
+    )
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(MessageHandler(filters.ChatType.GROUPS & filters.FORWARDED, handle_forwarded_message))
@@ -3,6 +3,8 @@ import os
 from typing import Dict, Optional, List
 from pydantic import BaseModel
 
+from bot.helper import atomic_write
+
 class VocabularyItem(BaseModel):
     word: str
     translation: str
@@ -31,9 +33,11 @@ class ContentDB:
     def _save_db(self) -> None:
         """
         Save the content database to a JSON file.
+
+        The data is written to a temporary file which then replaces the database file,
+        so an interrupted write never leaves a truncated database behind.
         """
-        with open(self.db_file, 'w') as f:
-            json.dump(self.db, f, indent=2)
+        atomic_write(self.db_file, json.dumps(self.db, indent=2))
 
     def add_content(self, url: str, content: Dict[str, str], vocabulary: Optional[List[VocabularyItem]] = None) -> None:
         """
@@ -57,7 +61,8 @@ class ContentDB:
         if content:
             content = content.copy()  # Create a copy to avoid modifying the original
             if content.get("vocabulary"):
-                content["vocabulary"] = [VocabularyItem(**item) for item in content["vocabulary"]]
+                # The items were dumped from validated models by add_content, no need to validate them again
+                content["vocabulary"] = [VocabularyItem.model_construct(**item) for item in content["vocabulary"]]
         return content
 
     def url_exists(self, url: str) -> bool:
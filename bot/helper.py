@@ -1,4 +1,25 @@
-from telegram.helpers import escape_markdown
+import os
+import tempfile
+
+# The umask of the process, read once: os.umask can only be read by setting it,
+# which is not safe to do while other threads may be creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Characters that must be escaped in Telegram's MarkdownV2, mapped to their escaped form
+_MARKDOWN_V2_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in "\\_*[]()~`>#+-=|{}.!"})
+
+def escape_markdown_v2(text):
+    """
+    Escape the text for Markdown V2 parsing in a single pass over the string.
+
+    Args:
+        text (str): The text to escape.
+
+    Returns:
+        str: The escaped text.
+    """
+    return text.translate(_MARKDOWN_V2_ESCAPE_TABLE)
 
 def format_vocabulary(vocabulary):
     """
@@ -12,8 +33,8 @@ def format_vocabulary(vocabulary):
     """
     vocabulary_items = []
     for item in vocabulary:
-        escaped_word = escape_markdown(item.word, version=2)
-        escaped_translation = escape_markdown(item.translation, version=2)
+        escaped_word = escape_markdown_v2(item.word)
+        escaped_translation = escape_markdown_v2(item.translation)
         vocabulary_items.append(f"{escaped_word} \\(_{escaped_translation}_\\)")
     
     return ",\n".join(vocabulary_items)
@@ -32,3 +53,30 @@ def trim_message(message, max_length=4096):
     if len(message) > max_length:
         return message[:max_length-3] + "..."
     return message
+
+def atomic_write(path, text):
+    """
+    Write the text to a file, replacing the file atomically.
+
+    The text is written to a temporary file in the same directory, which then replaces the
+    file, so an interrupted write never leaves a truncated file behind. The file keeps the
+    permissions of the file it replaces; a new file gets the permissions allowed by the umask.
+
+    Args:
+        path (str): Path of the file to write.
+        text (str): The new content of the file.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
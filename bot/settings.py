@@ -11,6 +11,8 @@ class AgentEngine(str, Enum):
 class ElevenLabsRotateMethod(str, Enum):
     BASIC = "basic"
     ROUND_ROBIN = "round-robin"
+    MOST_CREDITS = "most-credits"
+    WEIGHTED = "weighted"
 
 class Settings(BaseSettings):
     telegram_bot_token: str = Field(default="", env="TELEGRAM_BOT_TOKEN")
@@ -21,15 +23,19 @@ class Settings(BaseSettings):
     agent_engine: AgentEngine = Field(default=AgentEngine.GEMINI, env="AGENT_ENGINE")
     agent_engine_api_key: str = Field(default="", env="AGENT_ENGINE_API_KEY")
     agent_engine_model: str = Field(default="gemini-1.5-flash-002", env="AGENT_ENGINE_MODEL")
+    gemini_deacronymizer_max_tokens: int = Field(default=600, env="GEMINI_DEACRONYMIZER_MAX_TOKENS")
     keep_raw_engine_responses: bool = Field(default=False, env="KEEP_RAW_ENGINE_RESPONSES")
     raw_engine_responses_dir: str = Field(default=os.path.join("data", "responses"), env="RAW_ENGINE_RESPONSES_DIR")
     elevenlabs_api_key: str = Field(efault="", env="ELEVENLABS_API_KEY")
     elevenlabs_rotate_method: ElevenLabsRotateMethod = Field(default=ElevenLabsRotateMethod.BASIC, env="ELEVENLABS_ROTATE_METHOD")
+    elevenlabs_credit_cache_ttl: int = Field(default=300, env="ELEVENLABS_CREDIT_CACHE_TTL")
+    elevenlabs_preflight_credits: bool = Field(default=False, env="ELEVENLABS_PREFLIGHT_CREDITS")
     audio_output_dir: str = Field(default=os.path.join("data", "audio"), env="AUDIO_OUTPUT_DIR")
     content_output_dir: str = Field(default=os.path.join("data", "content"), env="CONTENT_OUTPUT_DIR")
     transcript_output_dir: str = Field(default=os.path.join("data", "transcript"), env="TRANSCRIPT_OUTPUT_DIR")
     translation_output_dir: str = Field(default=os.path.join("data", "translation"), env="TRANSLATION_OUTPUT_DIR")
     content_db: str = Field(default=os.path.join("data", "content_db.json"), env="CONTENT_DB")
+    openai_summary_cache: str = Field(default="", env="OPENAI_SUMMARY_CACHE")
     url_link: str = Field(default="", env="URL_LINK")
 
     def get_telegram_operators(self) -> List[str]:
@@ -1,4 +1,10 @@
-from .agents import summarize_article_by_gemini, summarize_article_by_openai
+from . import agents
 from .models import ResponseError
 
-__all__ = ['summarize_article_by_gemini', 'summarize_article_by_openai', 'ResponseError']
\ No newline at end of file
+__all__ = agents.__all__ + ['ResponseError']
+
+def __getattr__(name):
+    # Summarization functions are resolved lazily by the agents package
+    if name in agents.__all__:
+        return getattr(agents, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
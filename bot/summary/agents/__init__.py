@@ -1,4 +1,19 @@
-from .gemini.actor import summarize_article as summarize_article_by_gemini
-from .openai.actor import summarize_article as summarize_article_by_openai
+import importlib
 
-__all__ = ['summarize_article_by_gemini', 'summarize_article_by_openai']
+# The engine modules pull in heavy SDKs (google-generativeai, openai, tiktoken), so they
+# are imported on first access: a bot configured for one engine never loads the other one
+_LAZY_ATTRIBUTES = {
+    'summarize_article_by_gemini': ('.gemini.actor', 'summarize_article'),
+    'summarize_article_by_gemini_async': ('.gemini.actor', 'summarize_article_async'),
+    'summarize_article_by_openai': ('.openai.actor', 'summarize_article'),
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name, __package__), attribute)
+    globals()[name] = value
+    return value
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 import google.generativeai as genai
 import logging
@@ -13,7 +14,7 @@ from bot.settings import settings
 
 logger = logging.getLogger(__name__)
 
-def summarize_article(article: str, session_id: str = "") -> Union[NewsSummary, ResponseError]:
+async def summarize_article_async(article: str, session_id: str = "") -> Union[NewsSummary, ResponseError]:
     """Process a Spanish news article through a multi-stage pipeline to create an educational summary.
 
     This function orchestrates a three-stage process:
@@ -37,7 +38,7 @@ def summarize_article(article: str, session_id: str = "") -> Union[NewsSummary,
         GeminiBaseError: If an unexpected error occurs during the summarization process
 
     Example:
-        >>> result = summarize_article(
+        >>> result = await summarize_article_async(
         ...     article="Un largo artículo de noticias...",
         ...     target_language="Russian",
         ...     session_id="unique_session_123"
@@ -57,12 +58,12 @@ def summarize_article(article: str, session_id: str = "") -> Union[NewsSummary,
         if not session_id:
             session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         summarizer = Summarizer(settings.agent_engine_model, session_id)
-        minimal_summary = summarizer.generate(article)
+        minimal_summary = await summarizer.generate_async(article)
         if isinstance(minimal_summary, ResponseError):
             return minimal_summary
 
         deacronymizer = Deacronymizer(settings.agent_engine_model, session_id)
-        news_summary = deacronymizer.sanitize(
+        news_summary = await deacronymizer.sanitize_async(
             NewsContent(
                 original_article=article,
                 summary=minimal_summary.news_original
@@ -72,7 +73,7 @@ def summarize_article(article: str, session_id: str = "") -> Union[NewsSummary,
             return news_summary
 
         educator = Educator(settings.agent_engine_model, session_id)
-        translated_summary = educator.translate(
+        translated_summary = await educator.translate_async(
             NewsContent(
                 original_article=article,
                 summary=news_summary
@@ -92,6 +93,20 @@ def summarize_article(article: str, session_id: str = "") -> Union[NewsSummary,
         vocabulary=translated_summary.vocabulary
     )
 
+def summarize_article(article: str, session_id: str = "") -> Union[NewsSummary, ResponseError]:
+    """Synchronous wrapper around `summarize_article_async`.
+
+    Must not be called from a running event loop; use `summarize_article_async` there instead.
+
+    Args:
+        article (str): The original Spanish news article text to be processed
+        session_id (str): Unique identifier to track related agent responses belonging to the same session
+
+    Returns:
+        Union[NewsSummary, ResponseError]: See `summarize_article_async`
+    """
+    return asyncio.run(summarize_article_async(article, session_id))
+
 if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO,
@@ -1,18 +1,44 @@
 import os
+import asyncio
+import random
+import time
 from datetime import datetime
 from pydantic import BaseModel
 import google.generativeai as genai
 from google.generativeai import protos
+from google.api_core import exceptions as google_exceptions
 from google.ai.generativelanguage_v1beta.types import content
-from typing import Optional
+from typing import Optional, Type
 from textwrap import dedent
 import logging
 
 from .exceptions import GeminiUnexpectedFinishReason, GeminiModelError
+from ...models import ResponseError
 from bot.settings import settings
 
 import proto
 
+# Errors that are caused by the temporary state of the service (rate limits,
+# overload, timeouts) and are worth retrying
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+RETRY_BASE_DELAY = 1.0  # Seconds, doubled on every attempt
+RETRY_MAX_DELAY = 60.0  # Upper bound for a single delay in seconds
+
+def _backoff_delay(attempt: int) -> float:
+    """Calculate the delay before the next attempt using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Number of the attempt that has just failed, starting from 1
+
+    Returns:
+        float: Delay in seconds
+    """
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
 
 # From google.ai.generativelanguage_v1beta.types.Candidate
 # google/ai/generativelanguage_v1beta/types/generative_service.py
@@ -79,6 +105,8 @@ class ChatModelConfig(BaseModel):
         response_schema (Optional[content.Schema]): Schema defining the expected response format.
             If provided, responses will be formatted as JSON matching this schema.
         max_tokens (Optional[int]): Maximum number of tokens in the response.
+        max_attempts (int): Maximum number of attempts to generate a response when
+            the model fails with a transient error (rate limit, overload, timeout).
     """
     session_id: str = ""
     agent_id: str = ""
@@ -87,6 +115,7 @@ class ChatModelConfig(BaseModel):
     system_prompt: str = ""
     response_schema: Optional[content.Schema] = None
     max_tokens: Optional[int] = 500
+    max_attempts: int = 4
 
     class Config:
         arbitrary_types_allowed = True
@@ -133,6 +162,7 @@ class BaseChatModel:
 
         self._session_id = config.session_id
         self._agent_id = config.agent_id
+        self._max_attempts = config.max_attempts
 
     def _save_response(self, response: dict):
         """Save the raw response from the Gemini model to a file for debugging/logging purposes.
@@ -155,39 +185,54 @@ class BaseChatModel:
             with open(file_path, "w") as f:
                 f.write(str(response))
     
-    def _generate_response(self, prompt: str) -> str:
-        """Generate a response from the model based on the given prompt.
-
-        The prompt is added to the conversation history before generating the response.
-        The response is also added to the history for context in future interactions,
-        but only if generation is successful (finishes with STOP reason).
-        If there's an error or unexpected finish reason, the prompt is removed from history.
+    def _add_prompt(self, prompt: str):
+        """Add the prompt to the conversation history as a user message.
 
         Args:
             prompt (str): The input text to send to the model
+        """
+        prompt_content = protos.Content(parts=[protos.Part(text=dedent(prompt))], role="user")
+        self._history.append(prompt_content)
+
+    def _handle_attempt_error(self, e: Exception, attempt: int) -> float:
+        """Decide whether a failed attempt to generate a response should be retried.
+
+        Args:
+            e (Exception): The error raised by the model
+            attempt (int): Number of the failed attempt, starting from 1
+
+        Returns:
+            float: Delay in seconds before the next attempt
+
+        Raises:
+            GeminiModelError: If the error is not transient or no attempts are left
+        """
+        logger = logging.getLogger(self.__class__.__module__)
+
+        if isinstance(e, TRANSIENT_ERRORS) and attempt < self._max_attempts:
+            delay = _backoff_delay(attempt)
+            logger.warning(f"Attempt {attempt}/{self._max_attempts} failed with a transient error, retrying in {delay:.1f}s: {e}")
+            return delay
+
+        # Roll back the prompt from history on error
+        self._history.pop()
+        logger.error(f"Error generating response: {e}")
+        raise GeminiModelError(f"Error generating response: {e}") from e
+
+    def _handle_response(self, response) -> str:
+        """Extract the text of a generated response and update the conversation history.
+
+        Args:
+            response: The response returned by the Gemini model
 
         Returns:
             str: The generated response text from the model
 
         Raises:
-            GeminiModelError: If there is an error generating the response
             GeminiUnexpectedFinishReason: If the model stops for an unexpected reason
         """
-
         logger = logging.getLogger(self.__class__.__module__)
 
-        # Add prompt to history
-        prompt_content = protos.Content(parts=[protos.Part(text=dedent(prompt))], role="user")
-        self._history.append(prompt_content)
-        
-        try:    
-            response = self.model.generate_content(self._history)
-        except Exception as e:
-            # Roll back the prompt from history on error
-            self._history.pop()
-            logger.error(f"Error generating response: {e}")
-            raise GeminiModelError(f"Error generating response: {e}") from e
-
         self._save_response(response.candidates[0])
 
         finish_reason = FinishReason(response.candidates[0].finish_reason)
@@ -200,3 +245,85 @@ class BaseChatModel:
             self._history.pop()
             logger.error(f"Unexpected finish reason: {finish_reason.name}")
             raise GeminiUnexpectedFinishReason(f"{finish_reason.name}")
+
+    def _generation_failed(self, e: Exception, error_class: Type[Exception]) -> ResponseError:
+        """Handle an error raised by `_generate_response` or `_generate_response_async`.
+
+        Args:
+            e (Exception): The error raised while generating the response
+            error_class (Type[Exception]): The exception raised by the agent for generation errors
+
+        Returns:
+            ResponseError: If the model stopped generation for an unexpected reason
+
+        Raises:
+            error_class: For any other error
+        """
+        if isinstance(e, GeminiUnexpectedFinishReason):
+            return ResponseError(error=f"LLM engine responded with: {e}")
+
+        logger = logging.getLogger(self.__class__.__module__)
+        logger.error(f"Failed to generate response: {e}")
+        raise error_class(f"Failed to generate response: {e}")
+
+    def _generate_response(self, prompt: str) -> str:
+        """Generate a response from the model based on the given prompt.
+
+        The prompt is added to the conversation history before generating the response.
+        The response is also added to the history for context in future interactions,
+        but only if generation is successful (finishes with STOP reason).
+        If there's an error or unexpected finish reason, the prompt is removed from history.
+        Transient errors (rate limits, overload, timeouts) are retried with exponential
+        backoff and jitter up to `max_attempts` times.
+
+        Args:
+            prompt (str): The input text to send to the model
+
+        Returns:
+            str: The generated response text from the model
+
+        Raises:
+            GeminiModelError: If there is an error generating the response
+            GeminiUnexpectedFinishReason: If the model stops for an unexpected reason
+        """
+        self._add_prompt(prompt)
+
+        attempt = 1
+        while True:
+            try:
+                response = self.model.generate_content(self._history)
+                break
+            except Exception as e:
+                time.sleep(self._handle_attempt_error(e, attempt))
+                attempt += 1
+
+        return self._handle_response(response)
+
+    async def _generate_response_async(self, prompt: str) -> str:
+        """Asynchronous version of `_generate_response`.
+
+        Uses the native asynchronous Gemini client so that the event loop is not blocked
+        while the model generates the response.
+
+        Args:
+            prompt (str): The input text to send to the model
+
+        Returns:
+            str: The generated response text from the model
+
+        Raises:
+            GeminiModelError: If there is an error generating the response
+            GeminiUnexpectedFinishReason: If the model stops for an unexpected reason
+        """
+        self._add_prompt(prompt)
+
+        attempt = 1
+        while True:
+            try:
+                response = await self.model.generate_content_async(self._history)
+                break
+            except Exception as e:
+                await asyncio.sleep(self._handle_attempt_error(e, attempt))
+                attempt += 1
+
+        return self._handle_response(response)
@@ -8,7 +8,7 @@ from ...models import NewsContent, ResponseError
 from .prompts import system_prompt_deacronymizer as system_prompt
 from .prompts import news_article_example, news_summary_example
 from .base import BaseChatModel, ChatModelConfig
-from .exceptions import GeminiDeacronymizerError, GeminiUnexpectedFinishReason
+from .exceptions import GeminiDeacronymizerError
 from bot.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -18,11 +18,8 @@ deacronymized_item_schema = content.Schema(
     properties={
         "DeacronymizedItem": content.Schema(
             type=content.Type.OBJECT,
-            required=["chain_of_thought", "acronyms", "summary"],
+            required=["acronyms", "summary"],
             properties={
-                "chain_of_thought": content.Schema(
-                    type=content.Type.STRING,
-                ),
                 "acronyms": content.Schema(
                     type=content.Type.ARRAY,
                     items=content.Schema(
@@ -49,8 +46,9 @@ class Deacronymizer(BaseChatModel):
     making them more accessible to non-native Spanish speakers. It inherits from BaseChatModel
     and uses the system prompt defined in prompts.py.
 
-    The class processes NewsContent objects and returns DeacronymizedItem objects
-    containing the identified acronyms, their full forms, and the updated summary.
+    The class processes NewsContent objects and returns the updated summary. The model
+    responds with a DeacronymizedItem that lists the identified acronyms next to the
+    summary, but no free-form reasoning is requested to keep the output short.
 
     Attributes:
         Inherits all attributes from BaseChatModel
@@ -72,7 +70,7 @@ class Deacronymizer(BaseChatModel):
             temperature=0.2,
             system_prompt=system_prompt,
             response_schema=deacronymized_item_schema,
-            max_tokens=1000
+            max_tokens=settings.gemini_deacronymizer_max_tokens
         )
         super().__init__(model_config)
     
@@ -80,34 +78,44 @@ class Deacronymizer(BaseChatModel):
         """Process a news summary to expand all acronyms to their full forms.
 
         Takes a NewsContent object containing the original article and its summary,
-        identifies any acronyms present, and returns a DeacronymizedItem with the
-        expanded version of the summary and details about the identified acronyms.
+        identifies any acronyms present, and returns the expanded version of the summary.
+        The list of identified acronyms is requested from the model only as a compact
+        scaffolding for the replacement and is not returned.
 
         Args:
             news_content (NewsContent): Object containing the original article and its summary,
                 both in Spanish.
 
         Returns:
-            DeacronymizedItem: Object containing:
-                - chain_of_thought: Analysis of identified acronyms
-                - acronyms: List of identified acronyms and their full forms
-                - summary: Updated text with acronyms replaced by full forms
+            str: The summary with acronyms replaced by their full forms
+            ResponseError: If the model stops generation for an unexpected reason
 
         Raises:
             GeminiModelError: If there is an error in generating the response
             GeminiUnexpectedFinishReason: If the model stops generation for an unexpected reason
         """
 
-        logger.info(f"Sending a request to Gemini to deacronymize a news article.")
+        logger.info("Sending a request to Gemini to deacronymize a news article.")
 
         try:
             json_str = self._generate_response(news_content.model_dump_json())
-        except GeminiUnexpectedFinishReason as e:
-            return ResponseError(error=f"LLM engine responded with: {e}")
         except Exception as e:
-            logger.error(f"Failed to generate response: {e}")
-            raise GeminiDeacronymizerError(f"Failed to generate response: {e}")
-            
+            return self._generation_failed(e, GeminiDeacronymizerError)
+
+        return self._parse_response(json_str)
+
+    async def sanitize_async(self, news_content: NewsContent) -> Union[str, ResponseError]:
+        """Asynchronous version of `sanitize`."""
+        logger.info("Sending a request to Gemini to deacronymize a news article.")
+
+        try:
+            json_str = await self._generate_response_async(news_content.model_dump_json())
+        except Exception as e:
+            return self._generation_failed(e, GeminiDeacronymizerError)
+
+        return self._parse_response(json_str)
+
+    def _parse_response(self, json_str: str) -> str:
         try:
             data = json.loads(json_str)
             
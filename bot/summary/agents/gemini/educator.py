@@ -9,7 +9,7 @@ from .prompts import system_prompt_educator as system_prompt
 from .prompts import news_article_example, news_without_acronyms_example
 from .base import BaseChatModel, ChatModelConfig
 from .educator_helper import filter_vocabulary
-from .exceptions import GeminiEducatorError, GeminiUnexpectedFinishReason
+from .exceptions import GeminiEducatorError
 from bot.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -35,9 +35,11 @@ educating_item_schema = content.Schema(
                             ),
                             "level": content.Schema(
                                 type = content.Type.STRING,
+                                enum = ["A1", "A2", "B1", "B2", "C1", "C2"],
                             ),
                             "importance": content.Schema(
                                 type = content.Type.STRING,
+                                enum = ["high", "medium", "low"],
                             ),
                             "translation_language": content.Schema(
                                 type = content.Type.STRING,
@@ -133,16 +135,27 @@ class Educator(BaseChatModel):
             GeminiUnexpectedFinishReason: If the model stops generation unexpectedly
         """
 
-        logger.info(f"Sending a request to Gemini to translate a news article.")
+        logger.info("Sending a request to Gemini to translate a news article.")
 
         try:
             json_str = self._generate_response(news_content.model_dump_json())
-        except GeminiUnexpectedFinishReason as e:
-            return ResponseError(error=f"LLM engine responded with: {e}")
         except Exception as e:
-            logger.error(f"Failed to generate response: {e}")
-            raise GeminiEducatorError(f"Failed to generate response: {e}")
-            
+            return self._generation_failed(e, GeminiEducatorError)
+
+        return self._parse_response(json_str)
+
+    async def translate_async(self, news_content: NewsContent) -> Union[NewsSummary, ResponseError]:
+        """Asynchronous version of `translate`."""
+        logger.info("Sending a request to Gemini to translate a news article.")
+
+        try:
+            json_str = await self._generate_response_async(news_content.model_dump_json())
+        except Exception as e:
+            return self._generation_failed(e, GeminiEducatorError)
+
+        return self._parse_response(json_str)
+
+    def _parse_response(self, json_str: str) -> NewsSummary:
         try:
             data = json.loads(json_str)
         except (json.JSONDecodeError, KeyError) as e:
@@ -151,7 +164,8 @@ class Educator(BaseChatModel):
 
         educating_item = data["EducatingItem"]
 
-        vocabulary = [EducatingVocabularyItem(**item) for item in educating_item["vocabulary"]]
+        # The items already follow the response schema enforced by Gemini, so they are not validated again
+        vocabulary = [EducatingVocabularyItem.model_construct(**item) for item in educating_item["vocabulary"]]
         
         try:    
             filtered_vocabulary = filter_vocabulary(vocabulary)
@@ -1,4 +1,5 @@
 from typing import List
+import functools
 import unicodedata
 from difflib import SequenceMatcher
 import jellyfish
@@ -9,6 +10,8 @@ from ...models import EducatingVocabularyItem, VocabularyItem
 
 logger = logging.getLogger(__name__)
 
+# The same word is compared with each of its transliterations by both similarity checks
+@functools.lru_cache(maxsize=1024)
 def _normalize_string(s: str) -> str:
     """Normalize a string by removing accents and converting to lowercase.
     
@@ -81,9 +84,9 @@ def filter_vocabulary(vocabulary: List[EducatingVocabularyItem], similarity_thre
         
         similar = False
         for transliteration in transliterations:
-            is_similar_basic  = _is_similar_basic(word.word, transliteration, similarity_threshold)
-            is_similar_jellyfish = _is_similar_jellyfish(word.word, transliteration, similarity_threshold)
-            if is_similar_basic or is_similar_jellyfish:
+            # Jaro-Winkler is computed in C, so SequenceMatcher only runs when it does not find a match
+            if (_is_similar_jellyfish(word.word, transliteration, similarity_threshold)
+                    or _is_similar_basic(word.word, transliteration, similarity_threshold)):
                 logger.info(f"Word '{word.word}' is similar to '{word.translation}' ({transliteration})")
                 similar = True
                 break
@@ -107,7 +110,7 @@ def filter_vocabulary(vocabulary: List[EducatingVocabularyItem], similarity_thre
                 if importance in vocabulary_items[level]:
                     # Add all items from this importance/level combination
                     for item in vocabulary_items[level][importance]:
-                        results.append(VocabularyItem(word=item["word"], translation=item["translation"]))
+                        results.append(VocabularyItem.model_construct(word=item["word"], translation=item["translation"]))
                         if len(results) >= 3:  # Stop once we have 3 items
                             break
                 if len(results) >= 3:  # Stop once we have 3 items
@@ -48,7 +48,6 @@ Process:
 
 The output must follow the schema provided. Ensure that all fields are present and correctly formatted.
 Schema Description:
-- 'chain_of_thought': Step-by-step analysis of the summary to identify all acronyms
 - 'acronyms': List of acronyms and abbreviations used in the summary. Each element of the list is a map with the following keys:
   - 'acronym': The acronym or abbreviation used in the summary
   - 'full_form': The full form of the acronym or abbreviation
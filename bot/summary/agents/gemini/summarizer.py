@@ -8,7 +8,7 @@ from ...models import MinimalNewsSummary, ResponseError
 from .prompts import system_prompt_summarizer as system_prompt
 from .prompts import news_article_example
 from .base import BaseChatModel, ChatModelConfig
-from .exceptions import GeminiSummarizerError, GeminiUnexpectedFinishReason
+from .exceptions import GeminiSummarizerError
 from bot.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -72,22 +72,34 @@ class Summarizer(BaseChatModel):
         super().__init__(model_config)
     
     def generate(self, news_article: str) -> Union[MinimalNewsSummary, ResponseError]:
-        logger.info(f"Sending a request to Gemini to create a news summary.")
+        logger.info("Sending a request to Gemini to create a news summary.")
 
         try:
             json_str = self._generate_response(news_article)
-        except GeminiUnexpectedFinishReason as e:
-            return ResponseError(error=f"LLM engine responded with: {e}")
         except Exception as e:
-            logger.error(f"Failed to generate response: {e}")
-            raise GeminiSummarizerError(f"Failed to generate response: {e}")
-            
+            return self._generation_failed(e, GeminiSummarizerError)
+
+        return self._parse_response(json_str)
+
+    async def generate_async(self, news_article: str) -> Union[MinimalNewsSummary, ResponseError]:
+        """Asynchronous version of `generate`."""
+        logger.info("Sending a request to Gemini to create a news summary.")
+
+        try:
+            json_str = await self._generate_response_async(news_article)
+        except Exception as e:
+            return self._generation_failed(e, GeminiSummarizerError)
+
+        return self._parse_response(json_str)
+
+    def _parse_response(self, json_str: str) -> MinimalNewsSummary:
         try:
             data = json.loads(json_str)
             
             summary_data = data["MinimalNewsSummary"]
             
-            return MinimalNewsSummary(
+            # news_summary_schema is enforced by Gemini (voice_tag is an enum), so the fields are not validated again
+            return MinimalNewsSummary.model_construct(
                 voice_tag=summary_data["voice_tag"],
                 news_original=summary_data["news_original"]
             )
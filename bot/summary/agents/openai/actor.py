@@ -1,14 +1,55 @@
 import openai
-from typing import Optional
+import tiktoken
+import functools
+from typing import Optional, List, Dict, Any
 from textwrap import dedent
 import logging
 
 from ...models import NewsSummary
 from .prompts import system_prompt, news_article_example
+from .cache import SemanticSummaryCache
 from bot.settings import settings
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+MAX_RETRIES = 5  # Retries of rate-limited requests, done by the OpenAI client with exponential backoff
+MAX_ARTICLE_TOKENS = 6000  # Longer articles are truncated to cap the cost of a request
+MIN_ARTICLE_LENGTH = 50  # Shorter texts are not news articles and are rejected without a request
+DEFAULT_ENCODING = "o200k_base"  # Used when tiktoken does not know the configured model
+
+# The system message is built once and always sent first, so every request starts with
+# a byte-identical prefix that OpenAI's prompt caching can reuse
+_SYSTEM_MESSAGE = {"role": "system", "content": dedent(system_prompt).strip()}
+
+def _strict_json_schema(schema: Any) -> Any:
+    """
+    Marks every object in a JSON schema as closed, as OpenAI's strict structured outputs require.
+
+    Args:
+        schema (Any): A JSON schema produced by pydantic, or a part of it.
+
+    Returns:
+        Any: The schema with `additionalProperties` set to false for every object.
+    """
+    if isinstance(schema, dict):
+        schema = {key: _strict_json_schema(value) for key, value in schema.items()}
+        if schema.get("type") == "object":
+            schema["additionalProperties"] = False
+    elif isinstance(schema, list):
+        schema = [_strict_json_schema(item) for item in schema]
+    return schema
+
+# The strict JSON schema of the response is derived from the model once instead of on every request
+_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": NewsSummary.__name__,
+        "schema": _strict_json_schema(NewsSummary.model_json_schema()),
+        "strict": True,
+    },
+}
+
 class OpenAISummarizerError(Exception):
     """Custom exception for OpenAI Summarizer errors."""
     pass
@@ -24,12 +65,107 @@ class OpenAISummarizer:
         self.model_name = settings.agent_engine_model
         logger.info(f"Using OpenAI model {self.model_name}.")
 
-        self.model = openai.OpenAI(api_key=api_key)
+        self.model = openai.OpenAI(api_key=api_key, max_retries=MAX_RETRIES)
+        # The cache costs an embedding request per new article, so it is used only when configured
+        self.cache = SemanticSummaryCache(settings.openai_summary_cache) if settings.openai_summary_cache else None
+
+        try:
+            encoding_name = tiktoken.encoding_name_for_model(self.model_name)
+        except KeyError:
+            encoding_name = DEFAULT_ENCODING
+        try:
+            # tiktoken downloads the encoding on first use, so this can fail on a network error
+            self.encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            logger.error(f"Failed to load the {encoding_name} encoding: {str(e)}")
+            raise OpenAISummarizerError(f"Failed to load the {encoding_name} encoding: {str(e)}")
+
+    def _prepare_article(self, article: str) -> str:
+        """
+        Checks the article size before sending it to the API.
+
+        Args:
+            article (str): The full text of the news article.
+
+        Returns:
+            str: The article, truncated at a token boundary if it exceeds MAX_ARTICLE_TOKENS.
+
+        Raises:
+            OpenAISummarizerError: If the article is too short to be summarized.
+        """
+        if len(article.strip()) < MIN_ARTICLE_LENGTH:
+            logger.error(f"The article is too short to summarize ({len(article)} characters).")
+            raise OpenAISummarizerError("The article is too short to summarize.")
+
+        # Special-token markers in the article text are counted as plain text instead of raising ValueError
+        tokens = self.encoding.encode(article, disallowed_special=())
+        if len(tokens) > MAX_ARTICLE_TOKENS:
+            logger.warning(f"The article has {len(tokens)} tokens, truncating it to {MAX_ARTICLE_TOKENS} tokens.")
+            article = self.encoding.decode(tokens[:MAX_ARTICLE_TOKENS])
+
+        return article
+
+    def _get_embedding(self, article: str) -> Optional[List[float]]:
+        """
+        Calculates the embedding of the article used to find near-duplicate articles in the cache.
+
+        Args:
+            article (str): The full text of the news article.
+
+        Returns:
+            Optional[List[float]]: The embedding of the article, or None if the request fails.
+        """
+        try:
+            response = self.model.embeddings.create(model=EMBEDDING_MODEL, input=article)
+            return response.data[0].embedding
+        except openai.OpenAIError as oe:
+            logger.warning(f"Failed to calculate the article embedding: {str(oe)}")
+            return None
+
+    def _get_similar_cached_summary(self, embedding: Optional[List[float]]) -> Optional[NewsSummary]:
+        if embedding:
+            return self.cache.get_similar(embedding)
+        return None
+
+    def _completion_params(self, article: str) -> Dict[str, Any]:
+        """
+        Builds the parameters of the chat completion request for the article.
+
+        Args:
+            article (str): The full text of the news article to summarize.
+
+        Returns:
+            Dict[str, Any]: Keyword arguments for `chat.completions.create`.
+        """
+        return dict(
+            model=self.model_name,
+            messages=[
+                _SYSTEM_MESSAGE,
+                {"role": "user", "content": article}
+            ],
+            temperature=1,  # Adjust for creativity vs. determinism
+            max_tokens=300,    # Adjust based on expected output size
+            response_format=_RESPONSE_FORMAT,
+        )
+
+    def _parse_completion(self, completion) -> NewsSummary:
+        usage = completion.usage
+        if usage and usage.prompt_tokens_details:
+            logger.info(f"Prompt tokens: {usage.prompt_tokens}, cached: {usage.prompt_tokens_details.cached_tokens}.")
+
+        response = completion.choices[0].message
+        if response.refusal:
+            raise OpenAISummarizerError(f"API refused to generate summary: {response.refusal}")
+        return NewsSummary.model_validate_json(response.content)
 
     def create_news_summary(self, article: str) -> Optional[NewsSummary]:
         """
         Summarizes a news article using OpenAI API.
 
+        When the summary cache is configured (OPENAI_SUMMARY_CACHE), a summary cached for
+        the same or a semantically similar article is returned without a request to the
+        chat completion API.
+
         Args:
             article (str): The full text of the news article to summarize.
 
@@ -42,23 +178,24 @@ class OpenAISummarizer:
             OpenAISummarizerError: If there's an error during the summarization process.
         """
 
+        article = self._prepare_article(article)
+
+        embedding = None
+        if self.cache:
+            cached_summary = self.cache.get_exact(article)
+            if cached_summary:
+                logger.info("Found a cached summary for the same article.")
+                return cached_summary
+
+            embedding = self._get_embedding(article)
+            cached_summary = self._get_similar_cached_summary(embedding)
+            if cached_summary:
+                return cached_summary
+
         try:
             logger.info(f"Sending a request to OpenAI to create a news summary.")
-            completion = self.model.beta.chat.completions.parse(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": dedent(system_prompt)},
-                    {"role": "user", "content": article}
-                ],
-                temperature=1,  # Adjust for creativity vs. determinism
-                max_tokens=300,    # Adjust based on expected output size
-                response_format=NewsSummary,
-            )
-
-            response = completion.choices[0].message
-            if response.refusal:
-                raise OpenAISummarizerError(f"API refused to generate summary: {response.refusal}")
-            return response.parsed
+            completion = self.model.chat.completions.create(**self._completion_params(article))
+            summary = self._parse_completion(completion)
 
         except openai.OpenAIError as oe:
             logger.error(f"OpenAI API error: {str(oe)}")
@@ -67,6 +204,18 @@ class OpenAISummarizer:
             logger.error(f"Unexpected error during summarization: {str(e)}")
             raise OpenAISummarizerError(f"Unexpected error during summarization: {str(e)}")
 
+        if self.cache:
+            self.cache.add(article, embedding, summary)
+        return summary
+
+@functools.lru_cache(maxsize=1)
+def _get_summarizer() -> OpenAISummarizer:
+    """
+    Returns the summarizer shared by all requests so that the connection pools
+    of the OpenAI clients are reused across articles.
+    """
+    return OpenAISummarizer()
+
 def summarize_article(article: str, _session_id: str = "") -> Optional[NewsSummary]:
     """
     Summarizes a news article using the OpenAISummarizer.
@@ -79,9 +228,8 @@ def summarize_article(article: str, _session_id: str = "") -> Optional[NewsSumma
                                its Russian translation, a voice tag, and a vocabulary list.
                                Returns None if summarization fails.
     """
-    summarizer = OpenAISummarizer()
     try:
-        return summarizer.create_news_summary(article)
+        return _get_summarizer().create_news_summary(article)
     except OpenAISummarizerError as e:
         return None
 
@@ -98,4 +246,4 @@ if __name__ == "__main__":
         for item in summary.vocabulary:
             print(f"  {item.word}: {item.translation}")
     else:
-        print("Failed to create summary.")
\ No newline at end of file
+        print("Failed to create summary.")
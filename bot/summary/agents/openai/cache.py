@@ -0,0 +1,128 @@
+import os
+import json
+import math
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from ...models import NewsSummary
+from bot.helper import atomic_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.92  # Minimal cosine similarity to treat two articles as the same news
+DEFAULT_TTL = 7 * 24 * 60 * 60  # Cached summaries expire after one week
+
+def _normalize_article(article: str) -> str:
+    """Collapse whitespace so that formatting differences do not affect exact matches."""
+    return " ".join(article.split())
+
+def _article_hash(article: str) -> str:
+    return hashlib.sha256(_normalize_article(article).encode("utf-8")).hexdigest()
+
+def _unit_vector(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return vector
+    return [x / norm for x in vector]
+
+class SemanticSummaryCache:
+    """A persistent cache of news summaries produced for previously seen articles.
+
+    Exact repeats of an article are found by the SHA-256 of its normalized text.
+    Near-duplicates (e.g. the same news republished with a different footer) are
+    found by the cosine similarity of the article embeddings.
+    """
+
+    def __init__(self,
+                 cache_file: str,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 ttl: int = DEFAULT_TTL) -> None:
+        """
+        Initialize the cache with a JSON file used as a storage.
+
+        :param cache_file: Path to the JSON file used for storing cached summaries.
+        :param similarity_threshold: Minimal cosine similarity for a near-duplicate hit.
+        :param ttl: Time in seconds after which a cached summary is considered stale.
+        """
+        self.cache_file = cache_file
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, any]] = self._load_cache()
+        # The summarizer is shared by the worker threads of the bot, so the entries
+        # and the cache file are accessed under a lock
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> Dict[str, Dict[str, any]]:
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                logger.warning("Failed to load summary cache, starting with an empty one")
+        return {}
+
+    def _save_cache(self) -> None:
+        cache_dir = os.path.dirname(self.cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        atomic_write(self.cache_file, json.dumps(self.entries))
+
+    def _is_fresh(self, entry: Dict[str, any]) -> bool:
+        return time.time() - entry["timestamp"] < self.ttl
+
+    def get_exact(self, article: str) -> Optional[NewsSummary]:
+        """
+        Look up a summary for exactly the same article.
+
+        :param article: The full text of the news article.
+        :return: The cached summary, or None if there is no fresh entry for the article.
+        """
+        with self._lock:
+            entry = self.entries.get(_article_hash(article))
+        if entry and self._is_fresh(entry):
+            return NewsSummary.model_validate_json(entry["summary"])
+        return None
+
+    def get_similar(self, embedding: List[float]) -> Optional[NewsSummary]:
+        """
+        Look up a summary for the article most similar to the given embedding.
+
+        :param embedding: The embedding of the news article.
+        :return: The cached summary if the similarity exceeds the threshold, None otherwise.
+        """
+        query = _unit_vector(embedding)
+        best_entry, best_similarity = None, -1.0
+        with self._lock:
+            for entry in self.entries.values():
+                if not self._is_fresh(entry):
+                    continue
+                similarity = sum(a * b for a, b in zip(query, entry["embedding"]))
+                if similarity > best_similarity:
+                    best_entry, best_similarity = entry, similarity
+
+        if best_entry and best_similarity >= self.similarity_threshold:
+            logger.info(f"Found a cached summary with similarity {best_similarity:.3f}.")
+            return NewsSummary.model_validate_json(best_entry["summary"])
+        return None
+
+    def add(self, article: str, embedding: Optional[List[float]], summary: NewsSummary) -> None:
+        """
+        Store a summary for the article and drop the expired entries.
+
+        :param article: The full text of the news article.
+        :param embedding: The embedding of the news article, if it is available.
+        :param summary: The summary generated for the article.
+        """
+        new_entry = {
+            "timestamp": time.time(),
+            "embedding": _unit_vector(embedding) if embedding else [],
+            "summary": summary.model_dump_json()
+        }
+        with self._lock:
+            self.entries = {key: entry for key, entry in self.entries.items() if self._is_fresh(entry)}
+            self.entries[_article_hash(article)] = new_entry
+            # The file is written under the lock too, so an older snapshot cannot replace a newer one
+            self._save_cache()
@@ -18,7 +18,6 @@ class AcronymItem(BaseModel):
     full_form: str
 
 class DeacronymizedItem(BaseModel):
-    chain_of_thought: str
     acronyms: List[AcronymItem]
     summary: str
 
@@ -1,16 +1,25 @@
-import os
 import asyncio
 from dataclasses import dataclass
-from typing import List, Optional
-from telegram import Bot, InputFile
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional
+from telegram import Bot
 from telegram.constants import ParseMode
-from telegram.error import TelegramError
-from telegram.helpers import escape_markdown
+from telegram.error import RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
 from dotenv import load_dotenv
 
-from bot.helper import format_vocabulary, trim_message
+from bot.helper import escape_markdown_v2, format_vocabulary, trim_message
 from bot.settings import settings
 
+MAX_MESSAGE_LENGTH = 4096  # Telegram's limit for the text of a message
+TELEGRAM_CONNECTION_POOL_SIZE = 16  # Connections kept open to the Bot API, shared by concurrent calls
+
+# MarkdownV2 message templates; the static parts are already escaped,
+# only the substituted values need escaping
+TRANSCRIPT_TEMPLATE = "{url}\n\n*Español:*\n||{body}||"
+TRANSLATION_TEMPLATE = "*Ruso:*\n||{body}||"
+VOCABULARY_TEMPLATE = "Palabras para entender el audio:\n{body}"
+
 @dataclass
 class MessageContent:
     """
@@ -47,10 +56,29 @@ class TelegramSender:
         self.bot = bot
         self.channel_id = channel_id
 
+    async def _send_with_retry(self, send: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        """
+        Call a Bot send method, retrying once if Telegram asks to wait because of flood control.
+
+        Args:
+            send (Callable[..., Awaitable[Any]]): The Bot method to call, e.g. `bot.send_message`.
+            **kwargs: Arguments of the method.
+
+        Returns:
+            Any: The result of the method.
+        """
+        try:
+            return await send(**kwargs)
+        except RetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+            return await send(**kwargs)
+
     async def send_messages(self, content: MessageContent) -> bool:
         """
         Send a batch of messages to the Telegram channel.
 
+        The text messages are sent one after another in their order, then the voice note.
+
         Args:
             content (MessageContent): An object containing paths to the content to be sent.
 
@@ -61,56 +89,55 @@ class TelegramSender:
             TelegramSenderError: If there's an error sending any of the messages or accessing the files.
         """
         try:
-            # Check if all files are accessible
+            # Read the text content off the event loop, both files at once
+            transcript_text, translation_text = await asyncio.gather(
+                asyncio.to_thread(Path(content.transcript_path).read_text, encoding='utf-8'),
+                asyncio.to_thread(Path(content.translation_path).read_text, encoding='utf-8')
+            )
+            escaped_transcript = escape_markdown_v2(transcript_text)
+            escaped_translation = escape_markdown_v2(translation_text)
+            escaped_url = escape_markdown_v2(content.url)
+
+            messages = [
+                TRANSCRIPT_TEMPLATE.format(url=escaped_url, body=escaped_transcript),
+                TRANSLATION_TEMPLATE.format(body=escaped_translation)
+            ]
+            if content.vocabulary:
+                formatted_vocabulary = format_vocabulary(content.vocabulary)
+                messages.append(trim_message(VOCABULARY_TEMPLATE.format(body=formatted_vocabulary)))
+
+            # Send all text content in one message if it fits into Telegram's limit,
+            # otherwise send transcript, translation and vocabulary separately
+            combined_message = "\n\n".join(messages)
+            if len(combined_message) <= MAX_MESSAGE_LENGTH:
+                messages = [combined_message]
+
+            # A voice note that is expected but missing fails the batch before anything is sent.
+            # The library opens the file for every upload, so a retried upload sends it in full again
+            voice_note = None
             if content.voice_note_path:
-                with open(content.voice_note_path, 'rb'):
-                    pass
-            with open(content.transcript_path, 'r', encoding='utf-8'):
-                pass
-            with open(content.translation_path, 'r', encoding='utf-8'):
-                pass
-
-            # If all files are accessible, proceed with sending
-
-            # Send transcript with URL
-            with open(content.transcript_path, 'r', encoding='utf-8') as transcript:
-                transcript_text = transcript.read()
-                escaped_transcript = escape_markdown(transcript_text, version=2)
-                escaped_url = escape_markdown(content.url, version=2)
-                await self.bot.send_message(
+                voice_note = Path(content.voice_note_path)
+                if not voice_note.is_file():
+                    raise TelegramSenderError(f"Voice note not found: {content.voice_note_path}")
+
+            # The messages are sent one by one so that they appear in the channel in order,
+            # followed by the voice note; any failed send aborts the batch
+            for message in messages:
+                await self._send_with_retry(
+                    self.bot.send_message,
                     chat_id=self.channel_id,
-                    text=f"{escaped_url}\n\n" \
-                         f"*Español:*\n||{escaped_transcript}||",
+                    text=message,
                     parse_mode=ParseMode.MARKDOWN_V2,
                     disable_web_page_preview=True
                 )
 
-            # Send translation
-            with open(content.translation_path, 'r', encoding='utf-8') as translation:
-                translation_text = translation.read()
-                escaped_translation = escape_markdown(translation_text, version=2)
-                await self.bot.send_message(
-                    chat_id=self.channel_id,
-                    text=f"*Ruso:*\n||{escaped_translation}||",
-                    parse_mode=ParseMode.MARKDOWN_V2
-                )
-
-            # Send vocabulary if available
-            if content.vocabulary:
-                formatted_vocabulary = format_vocabulary(content.vocabulary)
-                vocabulary_message = f"Palabras para entender el audio:\n{formatted_vocabulary}"
-                
-                await self.bot.send_message(
+            if voice_note:
+                await self._send_with_retry(
+                    self.bot.send_voice,
                     chat_id=self.channel_id,
-                    text=trim_message(vocabulary_message),
-                    parse_mode=ParseMode.MARKDOWN_V2
+                    voice=voice_note
                 )
 
-            # Send voice note if path is provided and file exists
-            if content.voice_note_path and os.path.exists(content.voice_note_path):
-                with open(content.voice_note_path, 'rb') as voice_note:
-                    await self.bot.send_voice(chat_id=self.channel_id, voice=InputFile(voice_note))
-
             return True
 
         except IOError as e:
@@ -147,8 +174,9 @@ if __name__ == "__main__":
     if not settings.telegram_bot_token or not settings.telegram_channel_id:
         raise ValueError("TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID must be set in the .env file")
     
-    # Initialize the bot object
-    bot = Bot(token=settings.telegram_bot_token)
+    # Initialize the bot object with a persistent HTTP/2 connection pool
+    request = HTTPXRequest(http_version="2", connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE)
+    bot = Bot(token=settings.telegram_bot_token, request=request)
     
     content = MessageContent(
         url="https://example.com/article",
@@ -1,19 +1,107 @@
 import os
 import json
+import random
+import time
+import queue
+import atexit
 import logging
-from elevenlabs import VoiceSettings
-from elevenlabs.client import ElevenLabs
-from typing import Optional, Tuple, Dict, List
+import itertools
+import threading
+from typing import Optional, Tuple, Dict, Sequence, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+if TYPE_CHECKING:
+    import httpx
+    from elevenlabs.client import ElevenLabs
+
+from bot.helper import atomic_write
 from bot.settings import settings, ElevenLabsRotateMethod
 
+__all__ = ["convert_text_to_speech", "reset_tts", "TextToSpeech", "ElevenLabsError", "InsufficientCreditsError"]
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 SAFETY_FACTOR = 1.5  # Coefficient to multiply text length for safety
+RATE_LIMIT_COOLDOWN = 5  # Seconds a rate-limited key is skipped, doubled on every consecutive 429
+MAX_RATE_LIMIT_COOLDOWN = 300  # Upper bound of the rate limit cooldown
+QUOTA_COOLDOWN = 60 * 60  # Seconds an exhausted key is skipped when its reset time is unknown
+# Bytes read from the audio stream at once (the SDK default is 1 KiB) are sized to the expected
+# audio: mp3_22050_32 is 4 KB per second of speech, and a second of speech is about 15 characters
+AUDIO_BYTES_PER_CHARACTER = 300
+MIN_AUDIO_CHUNK_SIZE = 16 * 1024
+MAX_AUDIO_CHUNK_SIZE = 512 * 1024
+CLIENT_TIMEOUT = 60  # Timeout of the ElevenLabs requests, the SDK default
+SUBSCRIPTION_URL = "https://api.elevenlabs.io/v1/user/subscription"
+MAX_CREDIT_CHECKS = 8  # Maximum number of credit checks made at the same time
+REQUEST_TIMEOUT = (3.05, 10)  # Connect and read timeouts of the subscription requests
 DEFAULT_STATE_DIR = "data/state"
 DEFAULT_STATE_FILE = "tts.json"
+STATE_SAVE_DELAY = 60  # Seconds during which state changes are collected before writing them to the file
+
+# Daniel, onwK4e9ZLuTAKqWW03F9
+# Sarah, EXAVITQu4vr4xnSDxMaL
+# Laura, FGY2WhTYpPnrIDTdsKH5
+# Will, bIHbv24MWmeRgasZH58o
+VOICE_IDS = {
+    "female": "EXAVITQu4vr4xnSDxMaL",  # Sarah voice id
+    "male": "bIHbv24MWmeRgasZH58o"     # Will voice id
+}
+
+# Voice tags in the spellings they can come in, so that a lookup needs no case conversion
+_VOICE_ID_LOOKUP = {
+    tag: voice_id
+    for voice, voice_id in VOICE_IDS.items()
+    for tag in (voice, voice.capitalize(), voice.upper())
+}
+
+# Arguments of elevenlabs.VoiceSettings used for every conversion
+VOICE_SETTINGS = dict(
+    stability=0.32,
+    similarity_boost=0.75,
+    style=0.0,
+    use_speaker_boost=True,
+)
+
+def fetch_credit_usage(session: requests.Session, api_key: str) -> Tuple[int, int]:
+    """
+    Requests the current amount of used credits for a specific API key.
+
+    Args:
+        session (requests.Session): The session to make the request with.
+        api_key (str): The API key to check.
+
+    Returns:
+        Tuple[int, int]: A tuple containing (remaining_characters, next_reset_timestamp)
+
+    Raises:
+        requests.RequestException: If there's an error during the API request.
+    """
+    response = session.get(SUBSCRIPTION_URL, headers={"xi-api-key": api_key}, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+
+    character_count = data.get('character_count', 0)
+    character_limit = data.get('character_limit', 0)
+    next_reset = data.get('next_character_count_reset_unix', 0)
+
+    return character_limit - character_count, next_reset
+
+def _audio_chunk_size(text: str) -> int:
+    """Get the chunk size to read the audio of the text with, so that it comes in one or a few chunks."""
+    return min(max(len(text) * AUDIO_BYTES_PER_CHARACTER, MIN_AUDIO_CHUNK_SIZE), MAX_AUDIO_CHUNK_SIZE)
+
+# Directories already created by this process
+_ensured_dirs = set()
+
+def _ensure_dir(path: str):
+    """Create the directory unless it was already created by this process."""
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
 
 class ElevenLabsError(Exception):
     """Custom exception for ElevenLabs API errors."""
@@ -32,127 +120,325 @@ class TextToSpeech:
             raise ElevenLabsError("No ElevenLabs API keys found. Please set the ELEVENLABS_API_KEY environment variable.")
         
         self.rotate_method = settings.elevenlabs_rotate_method
-        
+
+        # Keys are picked for rotation by a position counter over the keys,
+        # a failed key is followed by the key at the next position
+        self._key_index: Dict[str, int] = {key: i for i, key in enumerate(self.api_keys)}
+        self._counter = itertools.count()
+
+        # Shortened keys to be shown in the logs
+        self._masked_keys: Dict[str, str] = {key: f"{key[:8]}..." for key in self.api_keys}
+
         self.state_path = os.path.join(state_dir, state_file)
         self.state = self._load_state()
+
+        # The state is kept in memory and written to the file by a background thread.
+        # The queue holds only the latest state, so all changes made within
+        # STATE_SAVE_DELAY seconds after a write are combined into the next one
+        self._state_lock = threading.Lock()
+        self._state_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._state_queue_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._state_writer = threading.Thread(target=self._write_state_loop, name="tts-state-writer", daemon=True)
+        self._state_writer.start()
+        # At exit the writer saves the pending state and stops, so the state is never
+        # written by two threads at once and a newer state is not replaced by an older one
+        atexit.register(self.close)
         
-        # Daniel, onwK4e9ZLuTAKqWW03F9
-        # Sarah, EXAVITQu4vr4xnSDxMaL
-        # Laura, FGY2WhTYpPnrIDTdsKH5
-        # Will, bIHbv24MWmeRgasZH58o
-        self.voice_ids = {
-            "female": "EXAVITQu4vr4xnSDxMaL",  # Sarah voice id
-            "male": "bIHbv24MWmeRgasZH58o"     # Will voice id
-        }
         self.token_safety_factor = SAFETY_FACTOR
 
-    def _load_api_keys(self) -> Dict[str, str]:
+        # Remaining credits per API key as (expiry, remaining_characters, next_reset_timestamp),
+        # the expiry is in terms of time.monotonic()
+        self._credit_cache: Dict[str, Tuple[float, int, int]] = {}
+        self.credit_cache_ttl = settings.elevenlabs_credit_cache_ttl
+
+        # Keys that failed a conversion are skipped until the time (in terms of time.monotonic())
+        # stored here, the number of consecutive rate limit errors defines the next backoff
+        self._key_cooldown: Dict[str, float] = {}
+        self._rate_limit_errors: Dict[str, int] = {}
+
+        # The subscription requests share one connection pool, failed on a gateway
+        # error they are retried with a short backoff
+        self._session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CREDIT_CHECKS, max_retries=retries))
+
+        # Clients are created once per API key so that their connection pools are reused
+        self._clients: Dict[str, "ElevenLabs"] = {}
+
+        # The character cost reported by ElevenLabs for the last conversion made by the thread
+        self._conversion_info = threading.local()
+
+        # The ElevenLabs SDK is imported here rather than at module level, so that
+        # the bot does not load it when voice notes are disabled
+        from elevenlabs import VoiceSettings
+        self._voice_settings = VoiceSettings(**VOICE_SETTINGS)
+
+    def _load_api_keys(self) -> Tuple[str, ...]:
         """
-        Load API keys from environment variable and create a circular linked list structure.
-        Returns a dict where each key points to the next key in rotation.
+        Load API keys from environment variable.
+        Returns the keys in the order of rotation.
         """
-        keys = settings.get_elevenlabs_api_keys()
-        if not keys:
-            return {}
-            
-        # Create circular linked list as a dictionary
-        api_keys = {}
-        for i in range(len(keys)):
-            api_keys[keys[i]] = keys[(i + 1) % len(keys)]
-            
-        logger.info(f"Created circular key chain with {len(api_keys)} keys")
-        return api_keys
+        keys = tuple(settings.get_elevenlabs_api_keys())
+        logger.info("Loaded %s keys for rotation", len(keys))
+        return keys
 
     def _load_state(self) -> Dict:
         """Load the state from file or create default if it doesn't exist."""
-        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(self.state_path))
         
         if os.path.exists(self.state_path):
             try:
                 with open(self.state_path, 'r') as f:
                     state = json.load(f)
-                    logger.info(f"The previous key was {state.get('last_key')[:8]}...")
+                    logger.info("The previous key was %s...", state.get('last_key')[:8])
                     # Validate that the last_key exists in our api_keys
-                    if state.get("last_key") not in self.api_keys:
-                        logger.warning("Stored last_key not found in current API keys, resetting state")
-                        state["last_key"] = self._get_next_key()
-                    return state
+                    if state.get("last_key") in self._key_index:
+                        # Continue the rotation from the key after the stored one
+                        self._counter = itertools.count(self._key_index[state["last_key"]] + 1)
+                        return state
+                    logger.warning("Stored last_key not found in current API keys, resetting state")
             except json.JSONDecodeError:
                 logger.warning("Failed to load state file, creating new state")
         
         # Default state - start with the first key
         state = {}
-        state["last_key"] = self._get_next_key()
+        state["last_key"] = self.api_keys[next(self._counter)]
         return state
 
     def _save_state(self, state: Dict):
-        """Save the state to file."""
+        """Save the state to file, replacing the file atomically."""
         try:
-            with open(self.state_path, 'w') as f:
-                json.dump(state, f)
+            with self._state_lock:
+                atomic_write(self.state_path, json.dumps(state, separators=(",", ":")))
         except Exception as e:
-            logger.error(f"Failed to save state: {e}")
+            logger.error("Failed to save state: %s", e)
+
+    def _write_state_loop(self):
+        """Write the queued states to file, at most once per STATE_SAVE_DELAY seconds."""
+        while True:
+            state = self._state_queue.get()
+            if state is None:
+                # The sentinel queued by close()
+                return
+            self._save_state(state)
+            # Closing the instance ends the delay, so the last state is written right away
+            self._closed.wait(STATE_SAVE_DELAY)
 
     def _update_key_state(self, key: str):
-        """Update the state with the new key and save it to file."""
-        if not hasattr(self, 'state'):
-            self.state = {}
+        """Update the state with the new key and queue saving it to file."""
         self.state["last_key"] = key
-        self._save_state(self.state)
+        state = dict(self.state)
+        with self._state_queue_lock:
+            # A closed instance no longer writes the state, the file may already belong to a new one
+            if self._closed.is_set():
+                return
+            while True:
+                try:
+                    self._state_queue.put_nowait(state)
+                    return
+                except queue.Full:
+                    # Drop the outdated state waiting for the writer
+                    try:
+                        self._state_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def close(self):
+        """Stop the background state writer once it has saved the queued state."""
+        with self._state_queue_lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+        atexit.unregister(self.close)
+        # No state is queued after the instance is closed, so the writer saves
+        # the pending state, if there is one, and then stops at the sentinel
+        self._state_queue.put(None)
+        self._state_writer.join()
 
     def _get_next_key(self) -> str:
         """Get the next API key in the rotation."""
-        current_key = None if not hasattr(self, 'state') else self.state.get('last_key')
-        if not current_key or current_key not in self.api_keys:
-            # If current key is invalid, start with the first key
-            next_key = next(iter(self.api_keys)) if self.api_keys else None
-        else:
-            next_key = self.api_keys[current_key]
+        next_key = self.api_keys[next(self._counter) % len(self.api_keys)]
         
         # Update state
         self._update_key_state(next_key)
         
         return next_key
 
-    def get_credit_usage(self, api_key: str) -> Tuple[int, int]:
+    def _next_key_after(self, key: str) -> str:
+        """Get the key following `key` in the rotation order."""
+        return self.api_keys[(self._key_index[key] + 1) % len(self.api_keys)]
+
+    def _first_key(self, required_tokens: int = 0) -> str:
+        """Get the key to try first, according to the rotation method."""
+        if self.rotate_method == ElevenLabsRotateMethod.BASIC:
+            return self.state.get("last_key")
+        if self.rotate_method == ElevenLabsRotateMethod.MOST_CREDITS:
+            return self._most_credits_key()
+        if self.rotate_method == ElevenLabsRotateMethod.WEIGHTED:
+            return self._weighted_random_key(required_tokens)
+        # ElevenLabsRotateMethod.ROUND_ROBIN
+        return self._get_next_key()
+
+    def _advance_key(self, current_key: str) -> str:
+        """Get the key to try after `current_key` failed, according to the rotation method."""
+        if self.rotate_method == ElevenLabsRotateMethod.BASIC:
+            # Only move to next key if current one fails
+            next_key = self._next_key_after(current_key)
+            self._update_key_state(next_key)
+            return next_key
+        if self.rotate_method in (ElevenLabsRotateMethod.MOST_CREDITS, ElevenLabsRotateMethod.WEIGHTED):
+            # The chosen key has failed, the rest are tried in sequence
+            return self._next_key_after(current_key)
+        # ElevenLabsRotateMethod.ROUND_ROBIN
+        return self._get_next_key()
+
+    def _weighted_random_key(self, required_tokens: int) -> str:
+        """
+        Get a random key among the keys that have enough characters for the conversion,
+        with the chance of a key proportional to its remaining characters.
+
+        The load is spread across the keys, while the keys with more credits are used more often.
+        """
+        usages = self._get_credit_usages([key for key in self.api_keys if not self._is_on_hold(key)])
+        eligible = {
+            key: remaining_characters
+            for key, (remaining_characters, _) in usages.items()
+            if remaining_characters >= required_tokens and remaining_characters > 0
+        }
+
+        if not eligible:
+            return self.api_keys[0]
+
+        chosen_key = random.choices(list(eligible), weights=list(eligible.values()))[0]
+        self._update_key_state(chosen_key)
+        return chosen_key
+
+    def _get_credit_usages(self, keys: Sequence[str]) -> Dict[str, Tuple[int, int]]:
+        """
+        Get the credit usage of several keys.
+
+        Values cached within `credit_cache_ttl` seconds are taken from the cache,
+        the rest of the keys are checked concurrently.
+
+        Args:
+            keys (Sequence[str]): The API keys to check.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: (remaining_characters, next_reset_timestamp) for every key
+                                        that was checked successfully.
+        """
+        usages = {}
+        stale_keys = []
+        now = time.monotonic()
+        for key in keys:
+            cached = self._credit_cache.get(key)
+            if cached and now < cached[0]:
+                usages[key] = cached[1], cached[2]
+            else:
+                stale_keys.append(key)
+
+        if not stale_keys:
+            return usages
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CREDIT_CHECKS, len(stale_keys))) as executor:
+            futures = {executor.submit(self.get_credit_usage, key): key for key in stale_keys}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    usages[key] = future.result()
+                except ElevenLabsError as e:
+                    logger.warning("Error checking API key %s: %s", self._masked_keys[key], e)
+        return usages
+
+    def _most_credits_key(self) -> str:
+        """
+        Get the key with the most remaining characters among the keys that are not on hold.
+
+        The credits of all keys are checked concurrently; values cached within
+        `credit_cache_ttl` seconds are used without a request.
+        """
+        usages = self._get_credit_usages([key for key in self.api_keys if not self._is_on_hold(key)])
+        remaining = {key: remaining_characters for key, (remaining_characters, _) in usages.items()}
+
+        if not remaining:
+            return self.api_keys[0]
+
+        best_key = max(remaining, key=remaining.get)
+        self._update_key_state(best_key)
+        return best_key
+
+    def _get_client(self, api_key: str) -> "ElevenLabs":
+        """Get the ElevenLabs client for the API key, creating it on first use."""
+        client = self._clients.get(api_key)
+        if client is None:
+            import httpx
+            from elevenlabs.client import ElevenLabs
+            http_client = httpx.Client(
+                timeout=CLIENT_TIMEOUT,
+                follow_redirects=True,
+                event_hooks={"response": [self._record_character_cost]}
+            )
+            # Concurrent conversions may create a client for the same key at once,
+            # only the first one stored is kept so that all of them share its connections
+            new_client = ElevenLabs(api_key=api_key, timeout=CLIENT_TIMEOUT, httpx_client=http_client)
+            client = self._clients.setdefault(api_key, new_client)
+            if client is not new_client:
+                http_client.close()
+        return client
+
+    def _record_character_cost(self, response: "httpx.Response"):
+        """Keep the number of characters a conversion was charged for, reported in its response headers."""
+        character_cost = response.headers.get("character-cost")
+        if character_cost is not None and response.request.url.path.startswith("/v1/text-to-speech/"):
+            self._conversion_info.character_cost = int(character_cost)
+
+    def get_credit_usage(self, api_key: str, use_cache: bool = True) -> Tuple[int, int]:
         """
         Requests the current amount of used credits for a specific API key.
 
+        The result is cached for `credit_cache_ttl` seconds, or until the credits are reset
+        if that happens earlier. Conversions update the cached value locally. If the request
+        fails, the last known value for the key is returned when there is one.
+
         Args:
             api_key (str): The API key to check.
+            use_cache (bool): Whether a cached value that has not expired yet can be returned.
 
         Returns:
             Tuple[int, int]: A tuple containing (remaining_characters, next_reset_timestamp)
 
         Raises:
-            ElevenLabsError: If there's an error during the API request.
+            ElevenLabsError: If there's an error during the API request and no cached value is available.
         """
-        url = "https://api.elevenlabs.io/v1/user/subscription"
-        headers = {"xi-api-key": api_key}
+        cached = self._credit_cache.get(api_key)
+        if use_cache and cached and time.monotonic() < cached[0]:
+            return cached[1], cached[2]
 
         try:
-            logger.info(f"Checking credit usage for API key {api_key[:8]}...")
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            character_count = data.get('character_count', 0)
-            character_limit = data.get('character_limit', 0)
-            next_reset = data.get('next_character_count_reset_unix', 0)
-
-            remaining_characters = character_limit - character_count
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Checking credit usage for API key %s", self._masked_keys[api_key])
+            remaining_characters, next_reset = fetch_credit_usage(self._session, api_key)
 
+            # A cached value must not outlive the reset of the credits
+            ttl = min(self.credit_cache_ttl, max(next_reset - time.time(), 0))
+            self._credit_cache[api_key] = (time.monotonic() + ttl, remaining_characters, next_reset)
             return remaining_characters, next_reset
 
         except requests.RequestException as e:
-            logger.error(f"Error fetching credit usage: {str(e)}")
+            if cached:
+                logger.warning("Error fetching credit usage, using the last known value: %s", e)
+                return cached[1], cached[2]
+            logger.error("Error fetching credit usage: %s", e)
             raise ElevenLabsError(f"Error fetching credit usage: {str(e)}")
 
-    def select_api_key(self, text_length: int) -> Tuple[str, ElevenLabs, int]:
+    def select_api_key(self, text_length: int) -> Tuple[str, "ElevenLabs", int]:
         """
         Selects an API key based on the rotation method:
         - `ElevenLabsRotateMethod.ROUND_ROBIN`: Rotates through all keys in sequence
         - `ElevenLabsRotateMethod.BASIC`: Uses the current key until it runs out of tokens
+        - `ElevenLabsRotateMethod.MOST_CREDITS`: Uses the key with the most remaining characters
+        - `ElevenLabsRotateMethod.WEIGHTED`: Picks a random key weighted by its remaining characters
 
         Args:
             text_length (int): The length of the text to be converted.
@@ -164,39 +450,165 @@ class TextToSpeech:
             InsufficientCreditsError: If no API key has sufficient credits.
         """
         required_tokens = int(text_length * self.token_safety_factor)
-        keys_tried = set()
+        self._check_keys_available()
+        current_key = self._first_key(required_tokens)
+
+        # All rotation methods cycle through the keys, so every key is tried once
+        for attempt in range(len(self.api_keys)):
+            if self._is_on_hold(current_key):
+                logger.info("API key %s is on hold, skipping it", self._masked_keys[current_key])
+            else:
+                try:
+                    remaining_characters, next_reset = self.get_credit_usage(current_key)
+                    if remaining_characters >= required_tokens:
+                        logger.info("Selected API key %s with %s characters remaining", self._masked_keys[current_key], remaining_characters)                        
+                        return current_key, self._get_client(current_key), remaining_characters
+                    elif remaining_characters > 0:
+                        # A shorter text may still fit, so the key is only skipped for this conversion
+                        logger.warning("API key %s has only %s characters remaining, skipping it for this text", self._masked_keys[current_key], remaining_characters)
+                    else:
+                        self._hold_until_reset(current_key, next_reset)
+                except ElevenLabsError as e:
+                    logger.warning("Error checking API key %s: %s", self._masked_keys[current_key], e)
+
+            if attempt == 0:
+                # The first key does not fit, so the rest are likely to be checked as well:
+                # check them at once to have their credits in the cache for the next iterations
+                self._get_credit_usages([key for key in self.api_keys if key != current_key and not self._is_on_hold(key)])
+            
+            # Move to next key based on rotation method
+            current_key = self._advance_key(current_key)
 
-        if self.rotate_method == ElevenLabsRotateMethod.BASIC:
-            current_key = self.state.get("last_key")
-        else:  # ElevenLabsRotateMethod.ROUND_ROBIN
-            current_key = self._get_next_key()
+        logger.error("No API key with sufficient credits found")
+        raise InsufficientCreditsError("Insufficient credits across all API keys.")
 
-        while len(keys_tried) < len(self.api_keys):
-            keys_tried.add(current_key)
-            
+    def _is_on_hold(self, api_key: str) -> bool:
+        return time.monotonic() < self._key_cooldown.get(api_key, 0)
+
+    def _hold_until_reset(self, api_key: str, next_reset: int):
+        """Put the API key on hold until its credits are reset at the `next_reset` unix timestamp."""
+        cooldown = max(next_reset - time.time(), 0)
+        self._key_cooldown[api_key] = time.monotonic() + cooldown
+        logger.warning("API key %s ran out of credits, skipping it for %d seconds", self._masked_keys[api_key], cooldown)
+
+    def _check_keys_available(self):
+        """
+        Make sure that at least one API key is not on hold.
+
+        Raises:
+            InsufficientCreditsError: If all keys are on hold, without making any request.
+        """
+        now = time.monotonic()
+        earliest = min(self._key_cooldown.get(key, 0) for key in self.api_keys)
+        if now < earliest:
+            if earliest == float("inf"):
+                raise InsufficientCreditsError("None of the API keys is accepted by ElevenLabs.")
+            logger.error("All API keys are on hold for at least %d seconds", earliest - now)
+            raise InsufficientCreditsError(f"Insufficient credits across all API keys, the earliest key is available in {int(earliest - now)} seconds.")
+
+    def _cool_down_key(self, api_key: str, error: Exception) -> bool:
+        """
+        Puts the API key on hold after ElevenLabs rejected a conversion made with it.
+
+        - Exhausted quota: the key is skipped until its credits are reset.
+        - Rate limit (429): the key is skipped for an exponentially growing period.
+        - Invalid key (401): the key is not used anymore.
+
+        Args:
+            api_key (str): The API key used for the failed conversion.
+            error (Exception): The error raised by the ElevenLabs client.
+
+        Returns:
+            bool: True if the error is related to the key and another key can be tried, False otherwise.
+        """
+        status_code = getattr(error, "status_code", None)
+
+        if status_code == 402 or (status_code == 401 and "quota_exceeded" in str(error.body)):
             try:
-                remaining_characters, _ = self.get_credit_usage(current_key)
-                if remaining_characters >= required_tokens:
-                    logger.info(f"Selected API key {current_key[:8]}... with {remaining_characters} characters remaining")                        
-                    client = ElevenLabs(api_key=current_key)
-                    return current_key, client, remaining_characters
-                else:
-                    logger.warning(f"API key {current_key[:8]}... has only {remaining_characters} characters remaining")
-            except ElevenLabsError as e:
-                logger.warning(f"Error checking API key {current_key[:8]}...: {e}")
-            
+                _, next_reset = self.get_credit_usage(api_key, use_cache=False)
+            except ElevenLabsError:
+                next_reset = time.time() + QUOTA_COOLDOWN
+            self._hold_until_reset(api_key, next_reset)
+            return True
+        elif status_code == 429:
+            self._credit_cache.pop(api_key, None)
+            errors = self._rate_limit_errors.get(api_key, 0)
+            self._rate_limit_errors[api_key] = errors + 1
+            cooldown = min(RATE_LIMIT_COOLDOWN * 2 ** errors, MAX_RATE_LIMIT_COOLDOWN)
+            logger.warning("API key %s is rate limited, skipping it for %s seconds", self._masked_keys[api_key], cooldown)
+        elif status_code == 401:
+            self._credit_cache.pop(api_key, None)
+            cooldown = float("inf")
+            logger.error("API key %s is not accepted by ElevenLabs, not using it anymore", self._masked_keys[api_key])
+        else:
+            return False
+
+        self._key_cooldown[api_key] = time.monotonic() + cooldown
+        return True
+
+    def _convert(self, client: "ElevenLabs", voice_id: str, text: str) -> bytes:
+        """Makes the text-to-speech request and returns the whole audio."""
+        logger.info("Making API request to ElevenLabs")
+        self._conversion_info.character_cost = None
+        response = client.text_to_speech.convert(
+            voice_id=voice_id,
+            output_format="mp3_22050_32",
+            text=text,
+            previous_text="Escucha la noticia del día.",
+            next_text="Eso es todo por ahora.",
+            model_id="eleven_multilingual_v2",
+            voice_settings=self._voice_settings,
+            apply_text_normalization="on",
+            request_options={"chunk_size": _audio_chunk_size(text)}
+        )
+
+        # The request is sent when the response is iterated
+        return b"".join(response)
+
+    def convert_with_failover(self, text: str, voice_id: str) -> Tuple[str, bytes]:
+        """
+        Converts text to speech without checking the credits of the API key beforehand.
+
+        The keys are tried in the order of the rotation method. A key rejected by ElevenLabs
+        because of exhausted credits, rate limiting or invalidity is put on hold and the
+        conversion is retried with the next key.
+
+        Args:
+            text (str): The text to convert to speech.
+            voice_id (str): The ElevenLabs voice id.
+
+        Returns:
+            Tuple[str, bytes]: A tuple containing the API key used for the conversion and the audio content.
+
+        Raises:
+            InsufficientCreditsError: If no API key could be used for the conversion.
+        """
+        from elevenlabs.core import ApiError
+
+        self._check_keys_available()
+        current_key = self._first_key(len(text))
+
+        # All rotation methods cycle through the keys, so every key is tried once
+        for _ in range(len(self.api_keys)):
+            if self._is_on_hold(current_key):
+                logger.info("API key %s is on hold, skipping it", self._masked_keys[current_key])
+            else:
+                try:
+                    audio_data = self._convert(self._get_client(current_key), voice_id, text)
+                    self._rate_limit_errors.pop(current_key, None)
+                    logger.info("Converted text to speech with API key %s", self._masked_keys[current_key])
+                    return current_key, audio_data
+                except ApiError as e:
+                    if not self._cool_down_key(current_key, e):
+                        raise
+
             # Move to next key based on rotation method
-            if self.rotate_method == ElevenLabsRotateMethod.BASIC:
-                # Only move to next key if current one fails
-                current_key = self.api_keys[current_key]
-                self._update_key_state(current_key)
-            else:  # ElevenLabsRotateMethod.ROUND_ROBIN
-                current_key = self._get_next_key()
+            current_key = self._advance_key(current_key)
 
-        logger.error("No API key with sufficient credits found")
+        logger.error("No API key could be used for the conversion")
         raise InsufficientCreditsError("Insufficient credits across all API keys.")
 
-    def text_to_speech_file(self, text: str, voice: str, output_path: str) -> Optional[Dict[str, any]]:
+    def text_to_speech_file(self, text: str, voice: str, output_path: str, voice_id: Optional[str] = None) -> Optional[Dict[str, any]]:
         """
         Converts text to speech and saves it as an MP3 file at the specified path.
 
@@ -204,72 +616,93 @@ class TextToSpeech:
             text (str): The text to convert to speech.
             voice (str): The voice to use ('male' or 'female').
             output_path (str): The path where the audio file should be saved.
+            voice_id (Optional[str]): The ElevenLabs voice id if the voice is already resolved.
 
         Returns:
             Optional[Dict[str, any]]: A dictionary containing the path of the saved audio file,
-                                      remaining characters, next reset timestamp, and used tokens,
-                                      or None if conversion failed.
+                                      the audio content, remaining characters, next reset timestamp,
+                                      and used tokens, or None if conversion failed.
 
         Raises:
             ElevenLabsError: If there's an error during the text-to-speech conversion.
             InsufficientCreditsError: If there are insufficient credits across all API keys.
         """
         try:
-            chosen_voice_id = self.voice_ids.get(voice.lower())
+            chosen_voice_id = voice_id or _VOICE_ID_LOOKUP.get(voice)
             if not chosen_voice_id:
-                logger.error(f"Invalid voice option: {voice}")
+                logger.error("Invalid voice option: %s", voice)
                 raise ElevenLabsError(f"Invalid voice option: {voice}. Choose 'male' or 'female'.")
 
-            api_key, client, remaining_characters_before = self.select_api_key(len(text))
-
-            logger.info("Making API request to ElevenLabs")
-            response = client.text_to_speech.convert(
-                voice_id=chosen_voice_id,
-                output_format="mp3_22050_32",
-                text=text,
-                previous_text="Escucha la noticia del día.",
-                next_text="Eso es todo por ahora.",
-                model_id="eleven_multilingual_v2",
-                voice_settings=VoiceSettings(
-                    stability=0.32,
-                    similarity_boost=0.75,
-                    style=0.0,
-                    use_speaker_boost=True,
-                ),
-                apply_text_normalization="on"
-            )
+            if settings.elevenlabs_preflight_credits:
+                api_key, client, _ = self.select_api_key(len(text))
+                audio_data = self._convert(client, chosen_voice_id, text)
+            else:
+                api_key, audio_data = self.convert_with_failover(text, chosen_voice_id)
 
             # Ensure the directory exists
-            output_dir = os.path.dirname(output_path)
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(os.path.dirname(output_path))
 
-            logger.info(f"Saving audio file to {output_path}")
+            # The audio is kept in memory so that callers can upload it right away
+            # without reading the file back from disk
+            logger.info("Saving audio file to %s", output_path)
             with open(output_path, "wb") as f:
-                for chunk in response:
-                    if chunk:
-                        f.write(chunk)
-
-            # Get credit usage after conversion
-            remaining_characters, next_reset = self.get_credit_usage(api_key)
-
-            # Calculate used tokens
-            used_tokens = remaining_characters_before - remaining_characters
+                f.write(audio_data)
+
+            # Use the cost reported with the audio, ElevenLabs charges a credit per character
+            # if the response does not report it
+            character_cost = self._conversion_info.character_cost
+            used_tokens = character_cost if character_cost is not None else len(text)
+
+            cached = self._credit_cache.get(api_key)
+            if cached and time.monotonic() < cached[0]:
+                # The credits after the conversion are derived from the known credits before it
+                remaining_characters, next_reset = cached[1] - used_tokens, cached[2]
+                self._credit_cache[api_key] = (cached[0], remaining_characters, next_reset)
+            else:
+                remaining_characters, next_reset = self.get_credit_usage(api_key)
             
-            logger.info(f"Text-to-speech conversion complete. Used {used_tokens} tokens")
+            logger.info("Text-to-speech conversion complete. Used %s tokens", used_tokens)
             return {
                 "audio_path": output_path,
+                "audio_data": audio_data,
                 "remaining_characters": remaining_characters,
                 "next_reset_timestamp": next_reset,
                 "used_tokens": used_tokens
             }
 
         except InsufficientCreditsError as e:
-            logger.error(f"Insufficient credits error: {str(e)}")
+            logger.error("Insufficient credits error: %s", e)
             raise e
         except Exception as e:
-            logger.error(f"Error during text-to-speech conversion: {str(e)}")
+            logger.error("Error during text-to-speech conversion: %s", e)
             raise ElevenLabsError(f"Error during text-to-speech conversion: {str(e)}")
 
+_tts_instance: Optional[TextToSpeech] = None
+_tts_lock = threading.Lock()
+
+def _get_text_to_speech() -> TextToSpeech:
+    """
+    Returns the TextToSpeech instance shared by all conversions, so that API keys and
+    rotation state are loaded once and ElevenLabs clients keep their connections.
+
+    The instance is created under a lock, so conversions started at the same time
+    from several threads do not create competing instances.
+    """
+    global _tts_instance
+    if _tts_instance is None:
+        with _tts_lock:
+            if _tts_instance is None:
+                _tts_instance = TextToSpeech()
+    return _tts_instance
+
+def reset_tts():
+    """Drop the shared TextToSpeech instance, e.g. after the settings were changed."""
+    global _tts_instance
+    with _tts_lock:
+        if _tts_instance is not None:
+            _tts_instance.close()
+        _tts_instance = None
+
 def convert_text_to_speech(text: str, voice: str, output_path: str) -> Optional[Dict[str, any]]:
     """
     Converts text to speech using the TextToSpeech class and saves it to the specified path.
@@ -281,13 +714,20 @@ def convert_text_to_speech(text: str, voice: str, output_path: str) -> Optional[
 
     Returns:
         Optional[Dict[str, any]]: A dictionary containing the path of the saved audio file,
-                                  remaining characters, next reset timestamp, and used tokens,
-                                  or None if conversion failed.
+                                  the audio content, remaining characters, next reset timestamp,
+                                  and used tokens, or None if conversion failed.
     """
-    logger.info(f"Starting text-to-speech conversion for voice: {voice}")
-    tts = TextToSpeech()
+    logger.info("Starting text-to-speech conversion for voice: %s", voice)
+
+    # An invalid voice is rejected before the keys and the state are loaded
+    voice_id = _VOICE_ID_LOOKUP.get(voice)
+    if not voice_id:
+        logger.error("Invalid voice option: %s", voice)
+        return None
+
+    tts = _get_text_to_speech()
     try:
-        return tts.text_to_speech_file(text, voice, output_path)
+        return tts.text_to_speech_file(text, voice, output_path, voice_id=voice_id)
     except (ElevenLabsError, InsufficientCreditsError) as e:
         return None
 
@@ -1,6 +1,15 @@
+import time
+import asyncio
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+from bs4 import BeautifulSoup, SoupStrainer
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Tuple, Optional
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 import logging
 
@@ -8,6 +17,35 @@ from bot.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Elements of a CRC891 article page
+CRC891_TITLE_CLASS = 'post-title entry-title'
+CRC891_CONTENT_CLASS = 'entry-content entry clearfix'
+CRC891_UNWANTED_TAGS = ['div', 'script', 'style', 'figure']  # Embedded blocks removed from the article text
+
+# Only the title and the content of a CRC891 article are built into the tree,
+# navigation, sidebars, comments and footers are skipped while parsing
+CRC891_STRAINER = SoupStrainer(['h1', 'div'], attrs={'class': [CRC891_TITLE_CLASS, CRC891_CONTENT_CLASS]})
+
+REQUEST_TIMEOUT = (5, 15)  # Connect and read timeouts of the page requests
+
+# Headers of the page requests, read-only as they are shared by all requests.
+# Brotli is advertised by urllib3 only when a brotli decoder is installed
+HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING
+})
+
+ARTICLE_CACHE_SIZE = 256  # Number of recently parsed articles kept in memory
+ARTICLE_CACHE_TTL = 60 * 60  # Seconds a parsed article is reused without fetching the page again
+
+# Pages are fetched through one session, so the connections to a news site are reused
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
 class WebParserError(Exception):
     """Custom exception for WebParser errors."""
     pass
@@ -16,9 +54,7 @@ class WebParser:
     """A class to parse news articles from specific websites."""
 
     def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        self.headers = HEADERS
 
     def get_page_content(self, url: str) -> str:
         """
@@ -35,7 +71,7 @@ class WebParser:
         """
         try:
             logger.info(f"Fetching page from {url}.")
-            response = requests.get(url, headers=self.headers)
+            response = _session.get(url, headers=self.headers, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             return response.content
         except requests.exceptions.RequestException as e:
@@ -59,30 +95,45 @@ class WebParser:
             content = self.get_page_content(url)
 
             logger.info("Parsing the page content.")
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = BeautifulSoup(content, 'lxml', parse_only=CRC891_STRAINER)
 
-            title = soup.find('h1', class_='post-title entry-title')
+            title = soup.find('h1', class_=CRC891_TITLE_CLASS)
             title_text = title.text.strip() if title else ""
 
-            content_div = soup.find('div', class_='entry-content entry clearfix')
+            content_div = soup.find('div', class_=CRC891_CONTENT_CLASS)
             
             if content_div:
-                for unwanted in content_div.find_all(['div', 'script', 'style', 'figure']):
+                # All unwanted elements are collected in one pass over the article subtree
+                for unwanted in content_div.find_all(CRC891_UNWANTED_TAGS):
                     unwanted.decompose()
                 content_text = content_div.get_text(separator='\n', strip=True)
             else:
                 content_text = ""
 
             if not title_text or not content_text:
+                logger.error("Failed to extract title or content")
                 raise WebParserError("Failed to extract title or content")
             
             logger.info(f"Successfully parsed the article with title '{title_text}'.")
 
             return title_text, content_text
+        except WebParserError:
+            # Fetch and extraction errors are already described, they are passed on as is
+            raise
         except Exception as e:
             logger.error(f"Error parsing article: {e}")
             raise WebParserError(f"Error parsing article: {e}")
 
+# Article parsers of the supported news sites by the host name of the article URL
+ARTICLE_PARSERS = {
+    'crc891.com': WebParser.parse_crc891_article,
+    'www.crc891.com': WebParser.parse_crc891_article,
+}
+
+# Recently parsed articles as url -> (expiry, (title, content)), the least recently used first
+_article_cache: "OrderedDict[str, Tuple[float, Tuple[str, str]]]" = OrderedDict()
+_article_cache_lock = threading.Lock()
+
 def parse_article(url: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Parses an article from a given URL.
@@ -92,14 +143,43 @@ def parse_article(url: str) -> Tuple[Optional[str], Optional[str]]:
 
     Returns:
         Tuple[Optional[str], Optional[str]]: A tuple containing the article title and content,
-        or (None, None) if parsing fails.
+        or (None, None) if parsing fails or the website is not supported.
     """
+    # An article parsed recently (e.g. when the previous attempt to summarize it failed)
+    # is returned without fetching and parsing the page again
+    with _article_cache_lock:
+        cached = _article_cache.get(url)
+        if cached and time.monotonic() < cached[0]:
+            _article_cache.move_to_end(url)
+            return cached[1]
+
+    host = urlparse(url).hostname
+    parse = ARTICLE_PARSERS.get(host)
+    if parse is None:
+        logger.error(f"Articles from '{host}' are not supported.")
+        return None, None
+
     parser = WebParser()
     try:
-        return parser.parse_crc891_article(url)
+        article = parse(parser, url)
     except WebParserError as e:
         return None, None
 
+    with _article_cache_lock:
+        _article_cache[url] = (time.monotonic() + ARTICLE_CACHE_TTL, article)
+        _article_cache.move_to_end(url)
+        if len(_article_cache) > ARTICLE_CACHE_SIZE:
+            _article_cache.popitem(last=False)
+    return article
+
+async def parse_article_async(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Asynchronous version of `parse_article`.
+
+    The page is fetched and parsed in a worker thread, so the event loop is not blocked.
+    """
+    return await asyncio.to_thread(parse_article, url)
+
 if __name__ == "__main__":
     if len(settings.url_link) > 0:
         title, content = parse_article(settings.url_link)